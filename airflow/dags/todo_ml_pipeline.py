@@ -11,14 +11,20 @@ Schedule: Daily at midnight
 
 from __future__ import annotations
 
-import json
 import os
 import random
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
 import mlflow
+import numpy as np
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+import pandas as pd
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from airflow.decorators import dag, task
 
 
@@ -32,6 +38,58 @@ default_args = {
     "retry_delay": timedelta(minutes=5),
 }
 
+# Airflow pools that cap concurrent access to external services
+# (created by the airflow-init service in docker-compose.yml)
+POSTGRES_POOL = "postgres_todos"
+MLFLOW_POOL = "mlflow_remote"
+
+# Column layout of the task table returned by extract_tasks
+# (created_at/updated_at are UTC epoch seconds)
+TASK_COLUMNS = [
+    "id",
+    "title",
+    "completed",
+    "tags",
+    "duration_minutes",
+    "priority_score",
+    "created_at",
+    "updated_at",
+]
+
+# Connection pool for the todo database, created lazily once per process.
+# With the LocalExecutor every task instance runs in a freshly forked process,
+# so the pool lives for a single extract_tasks call; connections are only
+# reused across tasks when they run in a long-lived worker process.
+_POOL: ThreadedConnectionPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_todo_db_pool() -> ThreadedConnectionPool:
+    """
+    Return this process's Postgres connection pool, creating it on first use.
+    
+    Connection parameters are read from the POSTGRES_* environment variables.
+    """
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                host = os.getenv("POSTGRES_HOST", "postgres")
+                port = int(os.getenv("POSTGRES_PORT", "5432"))
+                print(f"Creating Postgres connection pool for {host}:{port}")
+                _POOL = ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=int(os.getenv("POSTGRES_POOL_MAX", "8")),
+                    host=host,
+                    port=port,
+                    user=os.getenv("POSTGRES_USER", "todo"),
+                    password=os.getenv("POSTGRES_PASSWORD", "todo"),
+                    dbname=os.getenv("POSTGRES_DB", "tododb"),
+                    sslmode="prefer",
+                    connect_timeout=10,
+                )
+    return _POOL
+
 
 @dag(
     dag_id="todo_ml_pipeline",
@@ -47,41 +105,56 @@ def todo_ml_pipeline():
     Main DAG definition for the todo ML pipeline.
     """
 
-    @task
+    @task(pool=POSTGRES_POOL)
     def extract_tasks() -> dict[str, Any]:
         """
         Extract tasks from Postgres database.
         
         Returns:
-            Dictionary containing task data and metadata
+            Dictionary containing the tasks as a DataFrame, aggregate
+            statistics computed by Postgres, and metadata.
+            The DataFrame is serialized as Parquet by the XCom backend.
         """
-        # Database connection parameters from environment
-        db_config = {
-            "host": os.getenv("POSTGRES_HOST", "postgres"),
-            "port": int(os.getenv("POSTGRES_PORT", "5432")),
-            "user": os.getenv("POSTGRES_USER", "todo"),
-            "password": os.getenv("POSTGRES_PASSWORD", "todo"),
-            "database": os.getenv("POSTGRES_DB", "tododb"),
-        }
-        
-        print(f"Connecting to Postgres at {db_config['host']}:{db_config['port']}")
+        pool = get_todo_db_pool()
         
         conn = None
         try:
-            # Establish database connection with security parameters
-            conn = psycopg2.connect(
-                host=db_config["host"],
-                port=db_config["port"],
-                user=db_config["user"],
-                password=db_config["password"],
-                dbname=db_config["database"],
-                sslmode="prefer",
-                connect_timeout=10,
-            )
+            # Borrow a connection from the shared pool
+            conn = pool.getconn()
             
-            cursor = conn.cursor()
+            # Run the aggregate and the row fetch in one read-only snapshot so
+            # the statistics always describe exactly the rows returned
+            conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
             
-            # Execute query to fetch all tasks
+            # Compute dataset statistics in the database so only scalars
+            # cross the wire
+            with conn.cursor() as stats_cursor:
+                stats_cursor.execute("""
+                    SELECT
+                        COUNT(*),
+                        COUNT(*) FILTER (WHERE completed),
+                        COALESCE(AVG(duration_minutes), 0)::float8,
+                        COALESCE(AVG(priority_score), 0)::float8
+                    FROM todos
+                """)
+                total, completed, avg_duration, avg_priority = stats_cursor.fetchone()
+            
+            statistics = {
+                "total": total,
+                "completed": completed,
+                "pending": total - completed,
+                "avg_duration": round(avg_duration, 2),
+                "avg_priority": round(avg_priority, 3),
+            }
+            
+            # Named (server-side) cursor streams rows in chunks instead of
+            # materializing the whole table client-side
+            cursor = conn.cursor(name="todos_stream")
+            cursor.itersize = 5000
+            
+            # Fetch per-task rows for feature extraction; no ORDER BY so the
+            # server can stream rows without sorting the full table first.
+            # Timestamps are returned as epoch seconds.
             query = """
                 SELECT 
                     id, 
@@ -90,37 +163,37 @@ def todo_ml_pipeline():
                     tags, 
                     duration_minutes, 
                     priority_score,
-                    created_at,
-                    updated_at
+                    EXTRACT(EPOCH FROM created_at)::bigint,
+                    EXTRACT(EPOCH FROM updated_at)::bigint
                 FROM todos
-                ORDER BY created_at DESC
             """
             
             cursor.execute(query)
-            rows = cursor.fetchall()
             
-            # Transform rows into structured data
-            tasks = []
-            for row in rows:
-                task = {
-                    "id": row[0],
-                    "title": row[1],
-                    "completed": row[2],
-                    "tags": row[3] if row[3] else [],
-                    "duration_minutes": row[4],
-                    "priority_score": row[5],
-                    "created_at": row[6].isoformat() if row[6] else None,
-                    "updated_at": row[7].isoformat() if row[7] else None,
-                }
-                tasks.append(task)
+            # Transform rows into structured data as they arrive
+            rows = []
+            for row in cursor:
+                rows.append((
+                    row[0],
+                    row[1],
+                    row[2],
+                    row[3] if row[3] else [],
+                    row[4],
+                    row[5],
+                    row[6],
+                    row[7],
+                ))
             
             cursor.close()
             
+            tasks = pd.DataFrame.from_records(rows, columns=TASK_COLUMNS)
+            
             # Prepare return data
             result = {
                 "tasks": tasks,
-                "total_count": len(tasks),
-                "completed_count": sum(1 for t in tasks if t["completed"]),
+                "statistics": statistics,
+                "total_count": total,
+                "completed_count": completed,
                 "extraction_timestamp": datetime.utcnow().isoformat(),
             }
             
@@ -137,73 +210,77 @@ def todo_ml_pipeline():
             raise
         finally:
             if conn:
-                conn.close()
-                print("Database connection closed")
+                # Roll back any open transaction and restore the default session
+                # settings before returning it to the pool; connections that are
+                # broken or fail to reset are discarded instead, without masking
+                # the original exception
+                discard = bool(conn.closed)
+                if not discard:
+                    try:
+                        conn.rollback()
+                        conn.set_session(isolation_level="DEFAULT", readonly="DEFAULT")
+                    except psycopg2.Error as e:
+                        print(f"Connection reset failed, discarding connection: {e}")
+                        discard = True
+                pool.putconn(conn, close=discard)
+                print("Database connection returned to pool")
 
     @task
     def prepare_dataset(extraction_result: dict[str, Any]) -> dict[str, Any]:
         """
         Prepare dataset from extracted tasks.
         
+        Statistics are taken as computed by Postgres in extract_tasks; only
+        per-task features are derived here.
+        
         Args:
             extraction_result: Output from extract_tasks
             
         Returns:
             Dictionary containing prepared dataset and statistics
         """
-        tasks = extraction_result["tasks"]
+        tasks: pd.DataFrame = extraction_result["tasks"]
+        statistics = extraction_result["statistics"]
         
-        if not tasks:
+        if tasks.empty:
             print("Warning: No tasks found in database")
             return {
                 "dataset_size": 0,
-                "features": [],
-                "statistics": {"total": 0, "completed": 0, "pending": 0},
+                "features": pd.DataFrame(),
+                "statistics": statistics,
             }
         
-        # Compute basic statistics
-        total = len(tasks)
-        completed = sum(1 for t in tasks if t["completed"])
-        pending = total - completed
+        # Extract features for training as typed columns (struct of arrays),
+        # which the XCom backend stores as Parquet. Title and tag lengths need
+        # Python objects, so both are filled in one pass over the two columns.
+        size = len(tasks)
+        title_length = np.empty(size, dtype=np.int32)
+        tag_count = np.empty(size, dtype=np.int16)
+        for i, (title, tags) in enumerate(zip(tasks["title"], tasks["tags"])):
+            title_length[i] = len(title)
+            tag_count[i] = len(tags)
         
-        avg_duration = (
-            sum(t["duration_minutes"] for t in tasks) / total if total > 0 else 0
-        )
-        avg_priority = (
-            sum(t["priority_score"] for t in tasks) / total if total > 0 else 0
-        )
-        
-        # Extract features for training
-        features = []
-        for task in tasks:
-            feature = {
-                "title_length": len(task["title"]),
-                "has_tags": len(task["tags"]) > 0,
-                "tag_count": len(task["tags"]),
-                "duration_minutes": task["duration_minutes"],
-                "priority_score": task["priority_score"],
-                "completed": task["completed"],
-            }
-            features.append(feature)
+        features = pd.DataFrame({
+            "title_length": title_length,
+            "has_tags": tag_count > 0,
+            "tag_count": tag_count,
+            "duration_minutes": tasks["duration_minutes"].to_numpy(dtype=np.float32),
+            "priority_score": tasks["priority_score"].to_numpy(dtype=np.float32),
+            "completed": tasks["completed"].to_numpy(dtype=np.bool_),
+        })
         
         result = {
-            "dataset_size": total,
+            "dataset_size": len(features),
             "features": features,
-            "statistics": {
-                "total": total,
-                "completed": completed,
-                "pending": pending,
-                "avg_duration": round(avg_duration, 2),
-                "avg_priority": round(avg_priority, 3),
-            },
+            "statistics": statistics,
         }
         
-        print(f"Prepared dataset with {total} samples")
+        print(f"Prepared dataset with {len(features)} samples")
         print(f"Statistics: {result['statistics']}")
         
         return result
 
-    @task
+    @task(pool=MLFLOW_POOL)
     def train_model(dataset: dict[str, Any]) -> dict[str, Any]:
         """
         Train model and log to MLflow.
@@ -263,34 +340,52 @@ def todo_ml_pipeline():
         with mlflow.start_run(
             run_name=f"priority-model-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}"
         ) as run:
-            # Log parameters
-            mlflow.log_param("model_type", "rule_based")
-            mlflow.log_param("training_samples", dataset_size)
-            mlflow.log_param("keyword_bonus", keyword_bonus)
-            mlflow.log_param("tag_bonus", tag_bonus)
-            mlflow.log_param("duration_penalty", duration_penalty)
-            
-            # Log metrics
-            mlflow.log_metric("mae", mae)
-            mlflow.log_metric("f1", f1_score)
-            mlflow.log_metric("dataset_size", dataset_size)
-            mlflow.log_metric("completed_ratio", 
-                            statistics["completed"] / dataset_size if dataset_size > 0 else 0)
-            
-            # Log dataset statistics as metrics
-            mlflow.log_metric("avg_duration", statistics["avg_duration"])
-            mlflow.log_metric("avg_priority", statistics["avg_priority"])
-            
-            # Log model rules as parameter (avoids filesystem permission issues)
-            mlflow.log_param("model_rules_json", json.dumps(model_rules))
+            # Log parameters, metrics and tags in a single request. The batch
+            # is queued on MLflow's async logging thread, but it is flushed
+            # right after the artifact upload below, so little work overlaps it
+            timestamp = int(time.time() * 1000)
+            params = {
+                "model_type": "rule_based",
+                "training_samples": dataset_size,
+                "keyword_bonus": keyword_bonus,
+                "tag_bonus": tag_bonus,
+                "duration_penalty": duration_penalty,
+            }
+            metrics = {
+                "mae": mae,
+                "f1": f1_score,
+                "dataset_size": dataset_size,
+                "completed_ratio": (
+                    statistics["completed"] / dataset_size if dataset_size > 0 else 0
+                ),
+                # Dataset statistics
+                "avg_duration": statistics["avg_duration"],
+                "avg_priority": statistics["avg_priority"],
+            }
+            tags = {
+                "pipeline": "airflow",
+                "dag_id": "todo_ml_pipeline",
+                "execution_date": datetime.utcnow().isoformat(),
+            }
+            MlflowClient().log_batch(
+                run_id=run.info.run_id,
+                params=[Param(key, str(value)) for key, value in params.items()],
+                metrics=[
+                    Metric(key, float(value), timestamp, 0)
+                    for key, value in metrics.items()
+                ],
+                tags=[RunTag(key, value) for key, value in tags.items()],
+                synchronous=False,
+            )
             
-            # Log tags
-            mlflow.set_tag("pipeline", "airflow")
-            mlflow.set_tag("dag_id", "todo_ml_pipeline")
-            mlflow.set_tag("execution_date", datetime.utcnow().isoformat())
+            # Model rules go to artifact storage instead of a length-capped param
+            mlflow.log_dict(model_rules, "model/priority_rules.json")
             
             run_id = run.info.run_id
             experiment_id = run.info.experiment_id
+            
+            # Make sure queued data reaches the server before the run ends
+            mlflow.flush_async_logging()
         
         result = {
             "run_id": run_id,
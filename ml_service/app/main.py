@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import cached_property
 from typing import List
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, field_validator
 
-from .scoring import TodoFeatures, priority_score
+from .scoring import priority_score_batch
 
 app = FastAPI(
     title="Smart Todo Priority Service",
     summary="Assigns a normalized priority_score to todo items.",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -23,6 +26,10 @@ class TodoPayload(BaseModel):
     tags: List[str] = Field(default_factory=list, max_items=20)
     duration_minutes: int = Field(default=0, ge=0, le=1440)
 
+    @cached_property
+    def title_lc(self) -> str:
+        return self.title.lower()
+
     @field_validator("tags", mode="before")
     @classmethod
     def normalize_tags(cls, value: List[str]) -> List[str]:
@@ -56,29 +63,33 @@ def health() -> dict[str, str]:
 
 
 @app.post("/score", response_model=ScoreResponse, tags=["scoring"])
-def score(request: ScoreRequest) -> ScoreResponse:
+def score(request: ScoreRequest) -> ORJSONResponse:
     if len(request.todos) == 0:
         raise HTTPException(status_code=400, detail="at least one todo is required")
 
-    results: List[ScoreResult] = []
-    for todo in request.todos:
-        features = TodoFeatures(
-            title=todo.title,
-            completed=todo.completed,
-            created_at=todo.created_at,
-            due_date=todo.due_date,
-            tags=todo.tags,
-            duration_minutes=todo.duration_minutes,
-        )
-        results.append(
-            ScoreResult(
-                title=todo.title,
-                completed=todo.completed,
-                created_at=todo.created_at,
-                due_date=todo.due_date,
-                tags=todo.tags,
-                priority_score=priority_score(features),
-            )
+    todos = request.todos
+    scores = priority_score_batch(
+        titles_lc=[todo.title_lc for todo in todos],
+        tags=[todo.tags for todo in todos],
+        completed=[todo.completed for todo in todos],
+        created_at=[todo.created_at for todo in todos],
+        due_date=[todo.due_date for todo in todos],
+        duration_minutes=[todo.duration_minutes for todo in todos],
+    )
+
+    # Inputs were validated with the request; copy the declared fields
+    # without re-validating them.
+    results: List[ScoreResult] = [
+        ScoreResult.model_construct(
+            **{name: getattr(todo, name) for name in TodoPayload.model_fields},
+            priority_score=float(todo_score),
         )
-    return ScoreResponse(results=results)
+        for todo, todo_score in zip(todos, scores)
+    ]
+    # Return the response directly so FastAPI does not re-validate it against
+    # response_model. Dumping in JSON mode keeps pydantic's datetime format
+    # (UTC as "Z"); orjson only encodes the resulting plain values.
+    return ORJSONResponse(
+        ScoreResponse.model_construct(results=results).model_dump(mode="json")
+    )
 
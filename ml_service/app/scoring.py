@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, Sequence
+
+import numpy as np
 
 KEYWORD_WEIGHTS = {
     "urgent": 0.35,
@@ -21,6 +23,22 @@ TAG_WEIGHTS = {
     "feature": 0.15,
 }
 
+# Precomputed lookups for the per-request hot path.
+_KEYWORDS: tuple[tuple[str, float], ...] = tuple(KEYWORD_WEIGHTS.items())
+_TAG_WEIGHT = TAG_WEIGHTS.get
+_KEYWORD_WEIGHTS_VEC = np.array([weight for _, weight in _KEYWORDS])
+_TAG_INDEX = {tag: i for i, tag in enumerate(TAG_WEIGHTS)}
+_TAG_WEIGHTS_VEC = np.array(list(TAG_WEIGHTS.values()))
+
+# Bucket upper bounds (inclusive) and the bonus for each bucket, used by the
+# batch scorer. They mirror the branches in the scalar helpers below.
+_AGE_BINS = np.array([24, 24 * 3, 24 * 7])
+_AGE_BONUS = np.array([0.05, 0.1, 0.15, 0.2])
+_DUE_BINS = np.array([0, 24, 24 * 3, 24 * 7])
+_DUE_BONUS = np.array([0.3, 0.25, 0.2, 0.1, 0.05])
+_DURATION_BINS = np.array([0, 30, 60, 180, 480])
+_DURATION_BONUS = np.array([0.05, 0.08, 0.04, 0.0, -0.05, -0.12])
+
 
 @dataclass(frozen=True, slots=True)
 class TodoFeatures:
@@ -32,25 +50,111 @@ class TodoFeatures:
     duration_minutes: int = 0
 
 
-def priority_score(features: TodoFeatures) -> float:
+def priority_score(
+    *,
+    title: str,
+    completed: bool = False,
+    created_at: datetime | None = None,
+    due_date: datetime | None = None,
+    tags: Iterable[str] = (),
+    duration_minutes: int = 0,
+) -> float:
     """Return a normalized priority score in [0, 1]."""
+    now = datetime.now(timezone.utc).timestamp()
     score = 0.35
-    score += _keyword_bonus(features.title)
-    score += _tag_bonus(features.tags)
-    score += _age_bonus(_normalize_dt(features.created_at))
-    score += _due_date_bonus(_normalize_dt(features.due_date))
-    score += _duration_bonus(features.duration_minutes)
+    score += _keyword_bonus(title.lower())
+    score += _tag_bonus(tags)
+    score += _age_bonus(_normalize_dt(created_at), now)
+    score += _due_date_bonus(_normalize_dt(due_date), now)
+    score += _duration_bonus(duration_minutes)
 
-    if features.completed:
+    if completed:
         score -= 0.6
 
     return max(0.0, min(1.0, round(score, 3)))
 
 
-def _keyword_bonus(title: str) -> float:
-    title_lc = title.lower()
+def priority_score_batch(
+    titles_lc: Sequence[str],
+    tags: Sequence[Iterable[str]],
+    completed: Sequence[bool],
+    created_at: Sequence[datetime | None],
+    due_date: Sequence[datetime | None],
+    duration_minutes: Sequence[int],
+) -> np.ndarray:
+    """Return normalized priority scores in [0, 1] for a batch of todos.
+
+    Equivalent to calling priority_score on each todo, with titles passed
+    already lowercased. Text and datetime inputs are reduced to arrays here;
+    the arithmetic runs in _score_kernel.
+    """
+    now = datetime.now(timezone.utc).timestamp()
+
+    keyword_hits = np.array(
+        [[keyword in title_lc for keyword, _ in _KEYWORDS] for title_lc in titles_lc],
+        dtype=bool,
+    ).reshape(len(titles_lc), len(_KEYWORDS))
+    long_title = np.array([len(title_lc.split()) >= 8 for title_lc in titles_lc], dtype=bool)
+
+    # Count known tags per todo; anything else gets the flat unknown weight.
+    tag_hits = np.zeros((len(tags), len(_TAG_INDEX)))
+    unknown_tags = np.zeros(len(tags))
+    tag_index = _TAG_INDEX.get
+    for row, item in enumerate(tags):
+        for raw in item:
+            column = tag_index(raw.lower().strip())
+            if column is None:
+                unknown_tags[row] += 1
+            else:
+                tag_hits[row, column] += 1
+
+    return _score_kernel(
+        keyword_hits=keyword_hits,
+        long_title=long_title,
+        tag_hits=tag_hits,
+        unknown_tags=unknown_tags,
+        age_hours=(now - _epoch_seconds(created_at)) / 3600,
+        due_hours=(_epoch_seconds(due_date) - now) / 3600,
+        duration_minutes=np.asarray(duration_minutes, dtype=float),
+        completed=np.asarray(completed, dtype=bool),
+    )
+
+
+def _score_kernel(
+    *,
+    keyword_hits: np.ndarray,
+    long_title: np.ndarray,
+    tag_hits: np.ndarray,
+    unknown_tags: np.ndarray,
+    age_hours: np.ndarray,
+    due_hours: np.ndarray,
+    duration_minutes: np.ndarray,
+    completed: np.ndarray,
+) -> np.ndarray:
+    """Combine per-todo feature arrays into clipped scores.
+
+    Missing timestamps are NaN in age_hours/due_hours and get no bonus.
+    """
+    keyword_bonus = np.minimum(keyword_hits @ _KEYWORD_WEIGHTS_VEC + long_title * 0.05, 0.45)
+    tag_bonus = np.minimum(tag_hits @ _TAG_WEIGHTS_VEC + unknown_tags * 0.03, 0.25)
+
+    age_bonus = np.where(
+        np.isnan(age_hours), 0.0, _AGE_BONUS[np.digitize(age_hours, _AGE_BINS, right=True)]
+    )
+    due_bonus = np.where(
+        np.isnan(due_hours), 0.0, _DUE_BONUS[np.digitize(due_hours, _DUE_BINS, right=True)]
+    )
+    duration_bonus = _DURATION_BONUS[np.digitize(duration_minutes, _DURATION_BINS, right=True)]
+
+    score = 0.35 + keyword_bonus + tag_bonus + age_bonus + due_bonus + duration_bonus
+    score -= completed * 0.6
+
+    return np.clip(np.round(score, 3), 0.0, 1.0)
+
+
+def _keyword_bonus(title_lc: str) -> float:
     bonus = 0.0
-    for keyword, weight in KEYWORD_WEIGHTS.items():
+    for keyword, weight in _KEYWORDS:
         if keyword in title_lc:
             bonus += weight
     if len(title_lc.split()) >= 8:
@@ -61,17 +165,17 @@ def _keyword_bonus(title: str) -> float:
 def _tag_bonus(tags: Iterable[str]) -> float:
     if not tags:
         return 0.0
+    tag_weight = _TAG_WEIGHT
     bonus = 0.0
     for raw in tags:
-        tag = raw.lower().strip()
-        bonus += TAG_WEIGHTS.get(tag, 0.03)
+        bonus += tag_weight(raw.lower().strip(), 0.03)
     return min(bonus, 0.25)
 
 
-def _age_bonus(created_at: datetime | None) -> float:
+def _age_bonus(created_at: datetime | None, now: float) -> float:
     if created_at is None:
         return 0.0
-    age_hours = (datetime.now(timezone.utc) - created_at).total_seconds() / 3600
+    age_hours = (now - created_at.timestamp()) / 3600
     if age_hours <= 24:
         return 0.05
     if age_hours <= 24 * 3:
@@ -81,10 +185,10 @@ def _age_bonus(created_at: datetime | None) -> float:
     return 0.2
 
 
-def _due_date_bonus(due_date: datetime | None) -> float:
+def _due_date_bonus(due_date: datetime | None, now: float) -> float:
     if due_date is None:
         return 0.0
-    delta_hours = (due_date - datetime.now(timezone.utc)).total_seconds() / 3600
+    delta_hours = (due_date.timestamp() - now) / 3600
     if delta_hours <= 0:
         return 0.3
     if delta_hours <= 24:
@@ -110,6 +214,14 @@ def _duration_bonus(minutes: int) -> float:
     return -0.12
 
 
+def _epoch_seconds(values: Sequence[datetime | None]) -> np.ndarray:
+    """Return UTC epoch seconds for each value, with NaN for missing ones."""
+    return np.array(
+        [np.nan if value is None else _normalize_dt(value).timestamp() for value in values],
+        dtype=float,
+    )
+
+
 def _normalize_dt(value: datetime | None) -> datetime | None:
     if value is None:
         return None
@@ -118,5 +230,5 @@ def _normalize_dt(value: datetime | None) -> datetime | None:
     return value.astimezone(timezone.utc)
 
 
-__all__ = ["TodoFeatures", "priority_score"]
+__all__ = ["TodoFeatures", "priority_score", "priority_score_batch"]
 
@@ -3,10 +3,13 @@ from __future__ import annotations
 import json
 import os
 import random
+import time
 from pathlib import Path
 from typing import Any, Dict
 
 import mlflow
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
 
 EXPERIMENT_NAME = "todo-priority-model"
 ARTIFACT_TMP_DIR = Path("ml_training") / "tmp_artifacts"
@@ -37,11 +40,16 @@ def main() -> None:
 
     training_output = simulate_training()
 
-    with mlflow.start_run(run_name=os.getenv("MLFLOW_RUN_NAME", "rule-based-priority")):
-        mlflow.log_param("model_type", "rule_based")
-        mlflow.log_param("training_samples", 500)
-        mlflow.log_metric("mae", training_output["metrics"]["mae"])
-        mlflow.log_metric("f1", training_output["metrics"]["f1"])
+    with mlflow.start_run(run_name=os.getenv("MLFLOW_RUN_NAME", "rule-based-priority")) as run:
+        timestamp = int(time.time() * 1000)
+        MlflowClient().log_batch(
+            run_id=run.info.run_id,
+            params=[Param("model_type", "rule_based"), Param("training_samples", "500")],
+            metrics=[
+                Metric(key, value, timestamp, 0)
+                for key, value in training_output["metrics"].items()
+            ],
+        )
 
         ARTIFACT_TMP_DIR.mkdir(parents=True, exist_ok=True)
         artifact_file = ARTIFACT_TMP_DIR / "priority_rules.json"